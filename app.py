@@ -1,24 +1,176 @@
 # app.py
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import os
+from html import escape
 from pathlib import Path
 
 # -----------------------
 # Helpers for flexible column mapping
 # -----------------------
-def find_first_col(df, candidates):
-    """Return actual column name from df for first candidate present, or None."""
-    cols_lower = {c.lower(): c for c in df.columns}
-    for cand in candidates:
-        if cand.lower() in cols_lower:
-            return cols_lower[cand.lower()]
-    return None
+# Accepted CSV column names for each logical column, in order of preference
+CANDIDATES = {
+    'event_name': ["event_name", "title", "name"],
+    'date':       ["date", "event_date", "start_date"],
+    'location':   ["location", "city", "venue"],
+    'type':       ["type", "event_type", "mode"],
+    'category':   ["category", "tags", "topic"],
+    'price':      ["price", "cost", "fee"],
+    'link':       ["link", "url"],
+}
 
 def ensure_data_folder():
     Path("data").mkdir(parents=True, exist_ok=True)
 
+REQUIRED_COLS = ['event_name', 'date', 'location']
+
+def column_values(frame, col):
+    """Return a column as a list with missing values as "", or all "" if col is None."""
+    if not col:
+        return [""] * len(frame)
+    return ["" if pd.isna(v) else v for v in frame[col].tolist()]
+
+def shift_page(delta):
+    """Button callback: move the Home listing by delta pages."""
+    st.session_state.page += delta
+
+def file_mtime(path):
+    """Return modification time of path, or None if it does not exist."""
+    return path.stat().st_mtime if path.exists() else None
+
+def append_bookmark(path, row, rows):
+    """Save a new bookmark row to the CSV.
+
+    The row is appended as a single line when its columns match the header on disk;
+    otherwise (new columns, or an older file without __unique_key__) the whole file
+    is rewritten from rows, which already include the new one.
+    """
+    header = pd.read_csv(path, nrows=0).columns.tolist() if path.exists() and path.stat().st_size else []
+    fields = header + [k for k in row if k not in header]
+    if header and fields != header:
+        pd.DataFrame(rows, columns=fields).to_csv(path, index=False, lineterminator="\n")
+    else:
+        pd.DataFrame([row], columns=fields).to_csv(path, mode="a", header=not header, index=False, lineterminator="\n")
+
+# -----------------------
+# Cached loaders (keyed by file mtime so edits to the CSV invalidate them)
+# -----------------------
+@st.cache_data(show_spinner=False)
+def load_events(path, mtime):
+    """Read events CSV, normalize column names and map logical columns."""
+    # Sniff the header only, so the full parse can be limited to mapped columns
+    df = pd.read_csv(path, nrows=0)
+    raw_columns = df.columns.tolist()
+
+    # Normalize whitespace in column names
+    df.columns = [c.strip() for c in raw_columns]
+
+    # Flexible mapping for common column names: first candidate present wins
+    cols_lower = {c.lower(): c for c in df.columns}
+    col_map = {
+        k: next((cols_lower[c.lower()] for c in cands if c.lower() in cols_lower), None)
+        for k, cands in CANDIDATES.items()
+    }
+
+    if any(col_map.get(k) is None for k in REQUIRED_COLS):
+        # header-only frame is enough to report what was detected
+        return df, col_map, np.array([], dtype=str), [], []
+
+    raw_by_name = dict(zip(df.columns, raw_columns))
+    used = [raw_by_name[c] for c in dict.fromkeys(col_map.values()) if c]
+    # Reuse the Parquet copy written from this exact version of the CSV, if any
+    parquet_path = Path(path).with_suffix(".parquet")
+    stamp = repr(mtime).encode()
+    table = None
+    if parquet_path.exists():
+        try:
+            if (pq.read_schema(parquet_path).metadata or {}).get(b"source_mtime") == stamp:
+                table = pq.read_table(parquet_path, columns=used)
+        except (OSError, pa.ArrowInvalid):
+            table = None  # truncated or corrupt cache: parse the CSV instead
+    if table is None:
+        try:
+            # Stream the memory-mapped file in 1 MiB blocks rather than buffering it whole
+            with pa.memory_map(path, 'r') as source:
+                reader = pacsv.open_csv(
+                    source,
+                    read_options=pacsv.ReadOptions(block_size=1 << 20),
+                    # quoted fields may span lines (e.g. multi-line descriptions)
+                    parse_options=pacsv.ParseOptions(newlines_in_values=True),
+                    convert_options=pacsv.ConvertOptions(
+                        include_columns=used,
+                        column_types={c: pa.string() for c in used},
+                        strings_can_be_null=True,
+                    ),
+                )
+                table = reader.read_all()
+        except pa.ArrowInvalid:
+            # rows the Arrow parser rejects (e.g. short rows missing trailing fields)
+            # still load through pandas, which fills them with nulls as before
+            fallback = pd.read_csv(path, dtype=str, usecols=used)
+            table = pa.Table.from_pandas(
+                fallback[used], schema=pa.schema([(c, pa.string()) for c in used]), preserve_index=False
+            )
+        # Write beside the target and swap it in, so readers never see a partial file
+        tmp_path = parquet_path.with_name(f"{parquet_path.name}.{os.getpid()}.tmp")
+        try:
+            pq.write_table(table.replace_schema_metadata({"source_mtime": stamp}), tmp_path, compression="zstd")
+            os.replace(tmp_path, parquet_path)
+        except OSError:
+            # read-only deployments simply keep parsing the CSV
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+    df.columns = [c.strip() for c in df.columns]
+
+    # Low-cardinality filter columns: compare category codes instead of strings
+    for key in ('category', 'type', 'price'):
+        if col_map[key]:
+            df[col_map[key]] = df[col_map[key]].astype('category')
+
+    # Lowercased names for search, so keystrokes don't re-fold the column
+    lower_names = df[col_map['event_name']].fillna("").str.lower().to_numpy(dtype=str)
+
+    # Filter choices: the (already sorted) categories, without scanning rows
+    categories, types = (
+        df[col_map[k]].cat.categories.tolist() if col_map[k] else [] for k in ('category', 'type')
+    )
+    return df, col_map, lower_names, categories, types
+
+@st.cache_data(show_spinner=False)
+def load_bookmarks(path, mtime, columns, name_col, date_col):
+    """Read saved bookmarks, or an empty frame with the given columns if none exist."""
+    if mtime is None:
+        return pd.DataFrame(columns=columns + ["__unique_key__"])
+    bookmarks = pd.read_csv(path, dtype=str)
+    # ensure bookmarks has __unique_key__ column
+    if "__unique_key__" not in bookmarks.columns:
+        name, date = (bookmarks[c].fillna("") if c in bookmarks.columns else "" for c in (name_col, date_col))
+        bookmarks["__unique_key__"] = name + "__" + date
+    else:
+        # older saves wrote a missing name or date as "nan"; keys now use ""
+        bookmarks["__unique_key__"] = bookmarks["__unique_key__"].str.replace(r"^nan(?=__)|(?<=__)nan$", "", regex=True)
+    return bookmarks
+
+@st.cache_data(show_spinner=False)
+def analytics_aggregates(path, mtime):
+    """Free vs Paid counts and top 10 location counts (None where the column is missing)."""
+    df, col_map = load_events(path, mtime)[:2]
+    price_counts = loc_counts = None
+    if col_map.get('price'):
+        # missing prices count as Paid, as before
+        is_free = df[col_map['price']].str.strip().str.lower().eq("free").to_numpy(dtype=bool, na_value=False)
+        price_counts = pd.Series(np.where(is_free, "Free", "Paid")).value_counts()
+    if col_map.get('location'):
+        loc_counts = df[col_map['location']].fillna("Unknown").value_counts().head(10)
+    return price_counts, loc_counts
+
 # -----------------------
 # App config & CSS
 # -----------------------
@@ -57,6 +209,8 @@ st.markdown(
 ensure_data_folder()
 DATA_PATH = Path("events.csv")
 BOOKMARK_PATH = Path("bookmarks.csv")
+PAGE_SIZE = 25
+TABLE_THRESHOLD = 200
 
 # -----------------------
 # Load events or show sample creator
@@ -75,37 +229,27 @@ if not DATA_PATH.exists():
     st.stop()
 
 try:
-    df = pd.read_csv(DATA_PATH, dtype=str)
+    df, col_map, lower_names, categories, types = load_events(str(DATA_PATH), file_mtime(DATA_PATH))
 except Exception as e:
     st.error(f"Could not read {DATA_PATH}: {e}")
     st.stop()
 
-# Normalize whitespace in column names
-df.columns = [c.strip() for c in df.columns]
-
-# Flexible mapping for common column names
-col_map = {}
-col_map['event_name'] = find_first_col(df, ["event_name", "title", "name"])
-col_map['date']       = find_first_col(df, ["date", "event_date", "start_date"])
-col_map['location']   = find_first_col(df, ["location", "city", "venue"])
-col_map['type']       = find_first_col(df, ["type", "event_type", "mode"])
-col_map['category']   = find_first_col(df, ["category", "tags", "topic"])
-col_map['price']      = find_first_col(df, ["price", "cost", "fee"])
-col_map['link']       = find_first_col(df, ["link", "url"])
-
-required = ['event_name','date','location']
-missing_required = [k for k in required if col_map.get(k) is None]
+missing_required = [k for k in REQUIRED_COLS if col_map.get(k) is None]
 
 if missing_required:
     st.error("Your CSV is missing required columns: " + ", ".join(missing_required))
     st.info("Detected columns in CSV: " + ", ".join(df.columns))
     st.stop()
 
-# Setup bookmarks (keep unique key column)
-if BOOKMARK_PATH.exists():
-    bookmarks = pd.read_csv(BOOKMARK_PATH, dtype=str)
-else:
-    bookmarks = pd.DataFrame(columns=df.columns.tolist() + ["__unique_key__"])
+# Setup bookmarks (keep unique key column); rows kept in memory alongside a set of
+# their keys, and only reread when bookmarks.csv was changed outside this session
+bm_mtime = file_mtime(BOOKMARK_PATH)
+if 'bookmarks' not in st.session_state or st.session_state.bm_mtime != bm_mtime:
+    bookmarks = load_bookmarks(str(BOOKMARK_PATH), bm_mtime, df.columns.tolist(),
+                               col_map['event_name'], col_map['date'])
+    st.session_state.bookmarks = bookmarks.to_dict('records')
+    st.session_state.bookmark_keys = set(bookmarks["__unique_key__"])
+    st.session_state.bm_mtime = bm_mtime
 
 # Add header (logo optional)
 logo_path = Path("assets/logo.png")
@@ -123,20 +267,18 @@ else:
 # Navigation + Search (top)
 # -----------------------
 nav = st.radio("", ["Home", "Analytics", "Bookmarks"], horizontal=True)
-search = st.text_input("Search events (by name)", placeholder="Search e.g. 'cloud', 'hackathon'")
+search = st.text_input("Search events (by name)", placeholder="Search e.g. 'cloud', 'ai hackathon'")
 
 # Filters inline
 fcol1, fcol2, fcol3, fcol4 = st.columns([3,3,2,1])
 with fcol1:
     # category choices if available
     if col_map['category']:
-        categories = sorted(df[col_map['category']].dropna().unique().tolist())
         sel_category = st.multiselect("Category", ["All"] + categories, default=["All"])
     else:
         sel_category = ["All"]
 with fcol2:
     if col_map['type']:
-        types = sorted(df[col_map['type']].dropna().unique().tolist())
         sel_type = st.multiselect("Type", ["All"] + types, default=["All"])
     else:
         sel_type = ["All"]
@@ -151,26 +293,29 @@ with fcol4:
 # -----------------------
 # Filter logic
 # -----------------------
-filtered = df.copy()
+# Collect one boolean mask per active filter and index df only once
+masks = []
 
-# search
-if search:
-    filtered = filtered[filtered[col_map['event_name']].str.contains(search, case=False, na=False)]
+# search: every whitespace-separated term must appear in the name
+for term in search.lower().split():
+    masks.append(np.char.find(lower_names, term) >= 0)
 
 # category
 if col_map['category'] and sel_category and "All" not in sel_category:
-    filtered = filtered[filtered[col_map['category']].isin(sel_category)]
+    masks.append(df[col_map['category']].isin(sel_category).to_numpy())
 
 # type
 if col_map['type'] and sel_type and "All" not in sel_type:
-    filtered = filtered[filtered[col_map['type']].isin(sel_type)]
+    masks.append(df[col_map['type']].isin(sel_type).to_numpy())
 
 # price filter
 if col_map.get('price') and sel_price != "All":
-    if sel_price == "Free":
-        filtered = filtered[filtered[col_map['price']].str.lower() == "free"]
-    else:
-        filtered = filtered[filtered[col_map['price']].str.lower() != "free"]
+    prices = df[col_map['price']].cat.categories
+    free_labels = prices[prices.str.lower() == "free"]
+    is_free = df[col_map['price']].isin(free_labels).to_numpy()
+    masks.append(is_free if sel_price == "Free" else ~is_free)
+
+filtered = df.iloc[np.logical_and.reduce(masks)] if masks else df
 
 # -----------------------
 # HOME: show events in card-like layout
@@ -179,71 +324,83 @@ if nav == "Home":
     st.markdown("### Browse events")
     if filtered.empty:
         st.info("No events match your filters/search.")
+    elif len(filtered) > TABLE_THRESHOLD:
+        # Large result sets: one virtualized table instead of per-event cards and buttons
+        st.caption(f"{len(filtered)} events found. Narrow the search or filters to browse cards and bookmark.")
+        shown = [col_map[k] for k in ('event_name', 'date', 'location', 'category', 'type', 'price', 'link') if col_map[k]]
+        link_config = {col_map['link']: st.column_config.LinkColumn()} if col_map['link'] else None
+        st.dataframe(filtered[shown], use_container_width=True, column_config=link_config)
     else:
-        for idx, row in filtered.reset_index(drop=True).iterrows():
-            with st.container():
-                st.markdown('<div class="card">', unsafe_allow_html=True)
-                c1, c2 = st.columns([5,1])
-                with c1:
-                    title = row[col_map['event_name']]
-                    date = row[col_map['date']] if col_map['date'] else ""
-                    loc  = row[col_map['location']] if col_map['location'] else ""
-                    cat  = row[col_map['category']] if col_map['category'] else ""
-                    typ  = row[col_map['type']] if col_map['type'] else ""
-                    price_val = row[col_map['price']] if col_map['price'] else ""
-                    link = row[col_map['link']] if col_map['link'] else ""
-                    st.markdown(f"**{title}**  \n<small class='small'>{date}  •  {loc}  •  {typ}  •  {cat}</small>", unsafe_allow_html=True)
-                    if link:
-                        st.markdown(f"[Visit event]({link})")
-                with c2:
-                    unique_key = f"{title}__{date}"
-                    # ensure bookmarks has __unique_key__ column
-                    if "__unique_key__" not in bookmarks.columns:
-                      bookmarks["__unique_key__"] = bookmarks.apply(
-        lambda r: f"{r.get(col_map.get('event_name'), '')}__{r.get(col_map.get('date'), '')}",
-        axis=1
-    )
+        n = len(filtered)
+        n_pages = -(-n // PAGE_SIZE)
+        # start from the first page whenever the filters change
+        filter_state = (search, tuple(sel_category), tuple(sel_type), sel_price)
+        if st.session_state.get('page_filters') != filter_state:
+            st.session_state.page_filters = filter_state
+            st.session_state.page = 0
+        page = min(st.session_state.setdefault('page', 0), n_pages - 1)
+        st.session_state.page = page
+        start = page * PAGE_SIZE
+        view = filtered.iloc[start:start + PAGE_SIZE]
 
-                    already = (bookmarks["__unique_key__"] == unique_key).any()
-                    if already:
-                        st.button("Bookmarked", disabled=True, key=f"bm_{idx}_done")
-                    else:
-                        if st.button("Bookmark", key=f"bm_{idx}"):
-                            # append and save
-                            new_row = row.to_dict()
-                            new_row["__unique_key__"] = unique_key
-                            bookmarks = pd.concat([bookmarks, pd.DataFrame([new_row])], ignore_index=True, sort=False)
-                            bookmarks.to_csv(BOOKMARK_PATH, index=False)
-                            st.success("Saved to bookmarks")
-                            st.experimental_rerun()
-                st.markdown('</div>', unsafe_allow_html=True)
+        p1, p2, p3 = st.columns([1,6,1])
+        with p1:
+            st.button("Prev", key="page_prev", on_click=shift_page, args=(-1,), disabled=page == 0)
+        with p2:
+            st.markdown(f"<div class='small' style='text-align:center'>Page {page + 1} of {n_pages}  •  {n} events</div>", unsafe_allow_html=True)
+        with p3:
+            st.button("Next", key="page_next", on_click=shift_page, args=(1,), disabled=page >= n_pages - 1)
+
+        names, dates, locs, cats, typs, links = (
+            column_values(view, col_map[k]) for k in ('event_name', 'date', 'location', 'category', 'type', 'link')
+        )
+        # Build every card up front and send them as a single markdown element
+        cards = [
+            f"<div class='card'><strong>{escape(title)}</strong><br>"
+            f"<small class='small'>{escape(date)}  •  {escape(loc)}  •  {escape(typ)}  •  {escape(cat)}</small>"
+            + (f"<br><a href='{escape(link)}' target='_blank'>Visit event</a>" if link else "")
+            + "</div>"
+            for title, date, loc, cat, typ, link in zip(names, dates, locs, cats, typs, links)
+        ]
+        st.markdown("\n".join(cards), unsafe_allow_html=True)
+
+        # Bookmark buttons laid out in a grid rather than one container per event
+        st.markdown("#### Bookmark")
+        grid = st.columns(3)
+        for idx, (title, date) in enumerate(zip(names, dates)):
+            unique_key = f"{title}__{date}"
+            with grid[idx % len(grid)]:
+                if unique_key in st.session_state.bookmark_keys:
+                    st.button(f"Bookmarked: {title}", disabled=True, key=f"bm_{start + idx}_done")
+                elif st.button(f"Bookmark: {title}", key=f"bm_{start + idx}"):
+                    # append and save
+                    new_row = {k: "" if pd.isna(v) else v for k, v in view.iloc[idx].items()}
+                    new_row["__unique_key__"] = unique_key
+                    st.session_state.bookmarks.append(new_row)
+                    st.session_state.bookmark_keys.add(unique_key)
+                    append_bookmark(BOOKMARK_PATH, new_row, st.session_state.bookmarks)
+                    st.session_state.bm_mtime = file_mtime(BOOKMARK_PATH)
+                    load_bookmarks.clear()
+                    st.success("Saved to bookmarks")
+                    st.experimental_rerun()
 
 # -----------------------
 # ANALYTICS: Free vs Paid and top locations
 # -----------------------
 elif nav == "Analytics":
     st.markdown("### Analytics")
+    price_counts, loc_counts = analytics_aggregates(str(DATA_PATH), file_mtime(DATA_PATH))
     # price analysis
-    if col_map.get('price'):
-        price_series = df[col_map['price']].fillna("Unknown").apply(lambda x: "Free" if str(x).strip().lower()=="free" else "Paid")
-        price_counts = price_series.value_counts()
-        fig, ax = plt.subplots(figsize=(4,3))
-        ax.bar(price_counts.index, price_counts.values, color=["#2ecc71","#e74c3c"][:len(price_counts)])
-        ax.set_title("Free vs Paid")
-        ax.set_ylabel("Count")
-        st.pyplot(fig)
+    if price_counts is not None:
+        st.markdown("#### Free vs Paid")
+        st.bar_chart(price_counts)
     else:
         st.info("No price column found; skipping Free vs Paid chart.")
 
     # location distribution
-    loc_col = col_map.get('location')
-    if loc_col:
-        loc_counts = df[loc_col].fillna("Unknown").value_counts().head(10)
-        fig2, ax2 = plt.subplots(figsize=(7,3))
-        ax2.barh(loc_counts.index[::-1], loc_counts.values[::-1], color="#3498db")
-        ax2.set_title("Top locations (top 10)")
-        ax2.set_xlabel("Number of events")
-        st.pyplot(fig2)
+    if loc_counts is not None:
+        st.markdown("#### Top locations (top 10)")
+        st.bar_chart(loc_counts)
     else:
         st.info("No location column found; skipping location chart.")
 
@@ -252,6 +409,7 @@ elif nav == "Analytics":
 # -----------------------
 elif nav == "Bookmarks":
     st.markdown("### Bookmarked events")
+    bookmarks = pd.DataFrame(st.session_state.bookmarks)
     if bookmarks.empty:
         st.info("No bookmarks yet.")
     else:
@@ -260,7 +418,7 @@ elif nav == "Bookmarks":
         st.dataframe(bookmarks[display_cols].rename(columns={col_map.get('event_name'):'Event', col_map.get('date'):'Date', col_map.get('location'):'Location', col_map.get('price'):'Price'}))
         # delete option
         if "__unique_key__" in bookmarks.columns:
-         options = bookmarks["__unique_key__"].tolist()
+         options = list(dict.fromkeys(bookmarks["__unique_key__"].tolist()))
         else:
          options = []
 
@@ -269,7 +427,11 @@ elif nav == "Bookmarks":
         if st.button("Delete selected"):
             if to_delete:
                 bookmarks = bookmarks[~bookmarks["__unique_key__"].isin(to_delete)]
-                bookmarks.to_csv(BOOKMARK_PATH, index=False)
+                bookmarks.to_csv(BOOKMARK_PATH, index=False, lineterminator="\n")
+                load_bookmarks.clear()
+                st.session_state.bookmarks = [r for r in st.session_state.bookmarks if r["__unique_key__"] not in to_delete]
+                st.session_state.bookmark_keys -= set(to_delete)
+                st.session_state.bm_mtime = file_mtime(BOOKMARK_PATH)
                 st.success("Deleted selected bookmarks")
                 st.experimental_rerun()
             else:
@@ -0,0 +1,75 @@
+# tests/test_bookmarks.py
+import ast
+from pathlib import Path
+
+import pandas as pd
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+
+def load_helpers(*names):
+    """Compile the named top-level functions from app.py without running the Streamlit script."""
+    tree = ast.parse(APP_PATH.read_text(encoding="utf-8"))
+    funcs = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in names]
+    for func in funcs:
+        func.decorator_list = []  # drop st.cache_data
+    namespace = {"pd": pd}
+    exec(compile(ast.Module(body=funcs, type_ignores=[]), str(APP_PATH), "exec"), namespace)
+    return [namespace[name] for name in names]
+
+
+append_bookmark, load_bookmarks = load_helpers("append_bookmark", "load_bookmarks")
+
+
+def bookmark(name, date):
+    return {"event_name": name, "date": date, "location": "Goa", "type": "Conference",
+            "category": "AI", "price": "Paid", "link": "https://example.com",
+            "__unique_key__": f"{name}__{date}"}
+
+
+def reload(path):
+    return load_bookmarks(path, path.stat().st_mtime, [], "event_name", "date")
+
+
+def test_append_to_file_without_key_column_round_trips(tmp_path):
+    path = tmp_path / "bookmarks.csv"
+    path.write_text("event_name,date,location,type,category,price,link\n"
+                    "Old,2025-01-01,Pune,Meetup,AI,Free,https://a.example\n")
+    rows = reload(path).to_dict("records")
+
+    for new_row in (bookmark("New", "2025-02-01"), bookmark("Newer", "2025-03-01")):
+        rows.append(new_row)
+        append_bookmark(path, new_row, rows)
+
+    reloaded = reload(path)
+    assert reloaded["__unique_key__"].tolist() == ["Old__2025-01-01", "New__2025-02-01", "Newer__2025-03-01"]
+    assert pd.read_csv(path, nrows=0).columns.tolist()[-1] == "__unique_key__"
+
+
+def test_append_widens_header_without_dropping_fields(tmp_path):
+    path = tmp_path / "bookmarks.csv"
+    path.write_text("event_name,date,location,type,category,link,__unique_key__\n"
+                    "Old,2025-01-01,Pune,Meetup,AI,https://a.example,Old__2025-01-01\n")
+    rows = reload(path).to_dict("records")
+    new_row = bookmark("New", "2025-02-01")
+    rows.append(new_row)
+    append_bookmark(path, new_row, rows)
+
+    reloaded = reload(path)
+    assert len(reloaded) == 2
+    assert reloaded.loc[1, "price"] == "Paid"
+
+
+def test_append_creates_missing_file_with_header(tmp_path):
+    path = tmp_path / "bookmarks.csv"
+    new_row = bookmark("New", "2025-02-01")
+    append_bookmark(path, new_row, [new_row])
+
+    assert reload(path)["__unique_key__"].tolist() == ["New__2025-02-01"]
+
+
+def test_legacy_nan_key_parts_are_normalized(tmp_path):
+    path = tmp_path / "bookmarks.csv"
+    path.write_text("event_name,date,__unique_key__\nTitle,,Title__nan\n")
+
+    assert reload(path)["__unique_key__"].tolist() == ["Title__"]